@@ -17,6 +17,15 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./webshepherd.db"
 
+    # Insert a "scanning" record before each scan so it can be polled while
+    # running; off by default, which stores each scan with a single INSERT
+    ENABLE_PROGRESS_TRACKING: bool = False
+
+    # Connection pool (ignored for SQLite)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds
+
     # Security
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -31,11 +40,22 @@ class Settings(BaseSettings):
     # Rate limiting
     RATE_LIMIT_PER_HOUR: int = 1000
 
+    # In-process cache of recent scan results
+    SCAN_CACHE_SIZE: int = 1024
+    SCAN_CACHE_TTL: int = 300  # seconds
+
     # Scanning limits
     MAX_HTML_SIZE_MB: int = 5
     REQUEST_TIMEOUT: int = 10
     MAX_REDIRECTS: int = 5
 
+    # Outbound fetch concurrency: fixed global cap and adaptive per-host ceiling
+    FETCH_MAX_CONCURRENCY: int = 64
+    FETCH_PER_HOST_CONCURRENCY: int = 8
+
+    # Threads running WCAG rule checks (shared by all scans)
+    RULE_WORKERS: int = 4
+
     # User agent
     USER_AGENT: str = "WebShepherd/1.0 (WCAG Accessibility Checker; +https://yorik.space/webshepherd)"
 
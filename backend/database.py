@@ -2,22 +2,72 @@
 Database setup and models
 Using SQLAlchemy with async support
 """
+import msgspec
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Integer, Float, DateTime, Text, JSON
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, StaticPool
+from sqlalchemy import String, Integer, Float, DateTime, Text, event
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 from typing import Optional
 
 from config import settings
 
 
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# single writer, and synchronous=NORMAL is safe under WAL with far fewer fsyncs.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _engine_options() -> dict:
+    """Engine keyword arguments for the configured database"""
+    url = make_url(settings.DATABASE_URL)
+
+    if url.get_backend_name() == "sqlite":
+        options = {"connect_args": {"check_same_thread": False}}
+        if url.database in (None, "", ":memory:"):
+            # Every connection would get its own empty in-memory database
+            options["poolclass"] = StaticPool
+        else:
+            # Pooling a single file handle buys nothing for SQLite
+            options["poolclass"] = NullPool
+        return options
+
+    return {
+        # LIFO reuses the most recently returned connection, which keeps a hot
+        # core of connections and lets idle overflow ones time out
+        "pool_use_lifo": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    future=True
+    future=True,
+    **_engine_options()
 )
 
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
 # Create async session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -26,6 +76,41 @@ async_session_maker = async_sessionmaker(
 )
 
 
+def _encode_model(obj):
+    """msgspec fallback for values it can't encode natively (Pydantic models)"""
+    if isinstance(obj, BaseModel):
+        # Pydantic v2 keeps field values in __dict__; handing msgspec that
+        # mapping encodes the model without building a model_dump() copy
+        return obj.__dict__
+    raise NotImplementedError(f"Cannot encode {type(obj).__name__} to JSON")
+
+
+_json_encoder = msgspec.json.Encoder(enc_hook=_encode_model)
+_json_decoder = msgspec.json.Decoder()
+
+
+class FindingsJSON(TypeDecorator):
+    """
+    JSON column encoded and decoded with msgspec
+
+    Accepts a list of Finding models (or plain dicts) and stores it as JSON
+    text in a single C-level pass; reads come back as a list of dicts.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return _json_encoder.encode(value).decode("utf-8")
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return _json_decoder.decode(value)
+
+
 class Base(DeclarativeBase):
     """Base class for all database models"""
     pass
@@ -42,7 +127,7 @@ class ScanRecord(Base):
     score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     # JSON field for findings
-    findings: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    findings: Mapped[Optional[list]] = mapped_column(FindingsJSON, nullable=True)
 
     # Counters
     total_checks: Mapped[int] = mapped_column(Integer, default=0)
@@ -57,7 +142,7 @@ class ScanRecord(Base):
     robust_issues: Mapped[int] = mapped_column(Integer, default=0)
 
     # Metadata
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     scan_duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
@@ -69,6 +154,9 @@ async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips existing tables, so add any indexes they are missing
+        for index in ScanRecord.__table__.indexes:
+            await conn.run_sync(index.create, checkfirst=True)
 
 
 async def get_session() -> AsyncSession:
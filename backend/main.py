@@ -6,15 +6,13 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, HTTPException, Request, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 import logging
 
 from config import settings
 from database import init_db
+from middleware import PureASGIRateLimiter, ProxyHeadersLoggingMiddleware
 from models import ScanRequest, ScanResponse, ScanStatus
 from scanner import ScanEngine
 
@@ -22,9 +20,6 @@ from scanner import ScanEngine
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
 # Lifespan context manager for startup/shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,9 +27,13 @@ async def lifespan(app: FastAPI):
     logger.info("🐑 WebShepherd starting up...")
     await init_db()
     logger.info("✅ Database initialized")
+    scan_engine.fetcher.open()
+    scan_engine.open()
     yield
     # Shutdown
     logger.info("🐑 WebShepherd shutting down...")
+    await scan_engine.fetcher.close()
+    scan_engine.close()
 
 # Create FastAPI app
 app = FastAPI(
@@ -43,12 +42,19 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Add rate limiter
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Rate limit scan submissions per client IP (added before CORS so that
+# 429 responses still carry CORS headers)
+app.add_middleware(
+    PureASGIRateLimiter,
+    limit=settings.RATE_LIMIT_PER_HOUR,
+    window_seconds=3600,
+    paths=["/api/scan/", "/webshepherd/api/scan/"],
+    methods=["POST"],
+)
 
 # CORS middleware
 app.add_middleware(
@@ -59,22 +65,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Middleware to handle reverse proxy headers (for Cloudflare Tunnel)
-@app.middleware("http")
-async def handle_proxy_headers(request: Request, call_next):
-    """Handle X-Forwarded-* headers from reverse proxies like Cloudflare Tunnel"""
-    # Get the forwarded path if available
-    forwarded_proto = request.headers.get("x-forwarded-proto")
-    forwarded_host = request.headers.get("x-forwarded-host")
-    forwarded_prefix = request.headers.get("x-forwarded-prefix")
-
-    # Log all requests with detailed info
-    client_ip = request.headers.get("cf-connecting-ip") or request.headers.get("x-forwarded-for", "").split(",")[0].strip() or request.client.host if request.client else "unknown"
-
-    logger.info(f"📨 {request.method} {request.url.path} | Client: {client_ip} | Headers: CF={bool(request.headers.get('cf-connecting-ip'))}, FwdProto={forwarded_proto}")
-
-    response = await call_next(request)
-    return response
+# Log requests with reverse proxy headers (for Cloudflare Tunnel)
+app.add_middleware(ProxyHeadersLoggingMiddleware)
 
 # Initialize scan engine
 scan_engine = ScanEngine()
@@ -84,8 +76,7 @@ api_router = APIRouter(prefix="/api")
 
 
 @api_router.post("/scan/", response_model=ScanResponse)
-@limiter.limit(f"{settings.RATE_LIMIT_PER_HOUR}/hour")
-async def create_scan(request: Request, scan_request: ScanRequest):
+async def create_scan(scan_request: ScanRequest):
     """
     Submit a URL for WCAG 2.1 AA accessibility scanning
 
@@ -148,8 +139,7 @@ app.include_router(api_router)
 webshepherd_api_router = APIRouter(prefix="/webshepherd/api")
 
 @webshepherd_api_router.post("/scan/", response_model=ScanResponse)
-@limiter.limit(f"{settings.RATE_LIMIT_PER_HOUR}/hour")
-async def create_scan_webshepherd(request: Request, scan_request: ScanRequest):
+async def create_scan_webshepherd(scan_request: ScanRequest):
     """Submit a URL for scanning (via /webshepherd/api path)"""
     try:
         logger.info(f"Starting scan for URL: {scan_request.url}")
@@ -0,0 +1,128 @@
+"""
+Pure ASGI middleware for WebShepherd
+Implemented directly on (scope, receive, send) to avoid the request/response
+wrapping that BaseHTTPMiddleware adds to every request
+"""
+import json
+import logging
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+def _header(scope, name: bytes) -> str:
+    """Get a request header from the ASGI scope ('' if missing)"""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return ""
+
+
+class PureASGIRateLimiter:
+    """
+    Sliding-window rate limiter keyed on client IP
+
+    Each client keeps a deque of request timestamps from the last window.
+    Only requests matching `paths` and `methods` are counted. State is only
+    touched between awaits, so the event loop needs no extra locking.
+    """
+
+    def __init__(
+        self,
+        app,
+        limit: int,
+        window_seconds: float = 3600.0,
+        paths: Iterable[str] = (),
+        methods: Iterable[str] = ("POST",)
+    ):
+        self.app = app
+        self.limit = limit
+        self.window = window_seconds
+        self.paths = frozenset(paths)
+        self.methods = frozenset(methods)
+        self._hits: Dict[str, Deque[float]] = {}
+        self._last_sweep = time.monotonic()
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in self.methods
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        key = client[0] if client else "unknown"
+        now = time.monotonic()
+        cutoff = now - self.window
+
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+        while hits and hits[0] <= cutoff:
+            hits.popleft()
+
+        if len(hits) >= self.limit:
+            # hits is empty when limit is 0; then no slot frees up within a window
+            oldest = hits[0] if hits else now
+            retry_after = max(1, math.ceil(oldest + self.window - now))
+            logger.warning(f"Rate limit exceeded for {key} on {scope['path']}")
+            await self._reject(send, retry_after)
+            return
+
+        hits.append(now)
+        self._sweep(now, cutoff)
+        await self.app(scope, receive, send)
+
+    def _sweep(self, now: float, cutoff: float) -> None:
+        """Forget clients with no requests in the current window (at most once per window)"""
+        if now - self._last_sweep < self.window:
+            return
+        self._last_sweep = now
+        stale = [key for key, hits in self._hits.items() if not hits or hits[-1] <= cutoff]
+        for key in stale:
+            del self._hits[key]
+
+    async def _reject(self, send, retry_after: int) -> None:
+        """Send a 429 response in the same shape as the app's HTTP errors"""
+        body = json.dumps({
+            "error": f"Rate limit exceeded: {self.limit} per {self.window:g} seconds",
+            "status_code": 429
+        }).encode("utf-8")
+
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(retry_after).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class ProxyHeadersLoggingMiddleware:
+    """Log each request with the client IP forwarded by reverse proxies like Cloudflare Tunnel"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            cf_ip = _header(scope, b"cf-connecting-ip")
+            forwarded_for = _header(scope, b"x-forwarded-for").split(",")[0].strip()
+            forwarded_proto = _header(scope, b"x-forwarded-proto") or None
+            client = scope.get("client")
+            client_ip = cf_ip or forwarded_for or (client[0] if client else "unknown")
+
+            logger.info(
+                f"📨 {scope['method']} {scope['path']} | Client: {client_ip} | "
+                f"Headers: CF={bool(cf_ip)}, FwdProto={forwarded_proto}"
+            )
+
+        await self.app(scope, receive, send)
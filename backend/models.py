@@ -2,10 +2,12 @@
 Pydantic models for WebShepherd
 Data validation and schema definitions
 """
+import ipaddress
 from datetime import datetime
 from enum import Enum
 from typing import List, Optional
-from pydantic import BaseModel, HttpUrl, Field, validator
+from urllib.parse import urlsplit
+from pydantic import BaseModel, ConfigDict, HttpUrl, Field, field_validator
 
 
 class SeverityLevel(str, Enum):
@@ -38,32 +40,44 @@ class ScanRequest(BaseModel):
         examples=["https://example.com"]
     )
 
-    @validator('url')
+    @field_validator('url')
+    @classmethod
     def validate_public_url(cls, v):
         """Ensure URL is public (not localhost, private IPs, etc.)"""
-        url_str = str(v)
+        parts = urlsplit(str(v))
+        host = (parts.hostname or "").rstrip(".")
+
+        # Ensure HTTP/HTTPS only
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError("Only HTTP/HTTPS URLs are supported")
 
         # Block localhost
-        if 'localhost' in url_str or '127.0.0.1' in url_str:
+        if host == 'localhost' or host.endswith('.localhost'):
             raise ValueError("Cannot scan localhost URLs")
 
-        # Block private IP ranges (basic check)
-        private_patterns = ['192.168.', '10.', '172.16.', '172.31.']
-        if any(pattern in url_str for pattern in private_patterns):
-            raise ValueError("Cannot scan private IP addresses")
+        # Block loopback, private and other non-public IP addresses
+        try:
+            ip = ipaddress.ip_address(host)
+        except ValueError:
+            return v  # Domain name, not an IP literal
 
-        # Ensure HTTP/HTTPS only
-        if not url_str.startswith(('http://', 'https://')):
-            raise ValueError("Only HTTP/HTTPS URLs are supported")
+        if ip.is_loopback:
+            raise ValueError("Cannot scan localhost URLs")
+        # Anything not globally routable: private, shared (CGNAT), link-local,
+        # reserved, documentation, unspecified, ...; plus multicast, which
+        # is_global does not exclude
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError("Cannot scan private IP addresses")
 
         return v
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "url": "https://example.com"
             }
         }
+    )
 
 
 class Finding(BaseModel):
@@ -78,8 +92,10 @@ class Finding(BaseModel):
     remediation: str = Field(..., description="How to fix this issue")
     count: int = Field(default=1, description="Number of occurrences")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        extra='ignore',
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "rule_code": "IMG_ALT_MISSING",
                 "severity": "fail",
@@ -92,6 +108,7 @@ class Finding(BaseModel):
                 "count": 3
             }
         }
+    )
 
 
 class ScanResponse(BaseModel):
@@ -119,8 +136,10 @@ class ScanResponse(BaseModel):
     understandable_issues: int = Field(default=0)
     robust_issues: int = Field(default=0)
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        extra='ignore',
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "scan_id": "abc123xyz",
                 "url": "https://example.com",
@@ -148,6 +167,7 @@ class ScanResponse(BaseModel):
                 "scan_duration_ms": 5234
             }
         }
+    )
 
 
 class StatsResponse(BaseModel):
@@ -157,8 +177,10 @@ class StatsResponse(BaseModel):
     average_score: float
     common_issues: List[dict]
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        extra='ignore',
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "total_scans": 1247,
                 "scans_today": 34,
@@ -169,3 +191,4 @@ class StatsResponse(BaseModel):
                 ]
             }
         }
+    )
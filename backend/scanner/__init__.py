@@ -1,9 +1,24 @@
 """
 WebShepherd Scanner Module
 Handles URL fetching, parsing, and WCAG rule execution
+
+The exports are imported on first access, so scanner.parser and
+scanner.rules can be used without loading the engine's database and HTTP
+dependencies.
 """
-from .engine import ScanEngine
-from .fetcher import URLFetcher
-from .parser import HTMLParser
+from importlib import import_module
 
 __all__ = ["ScanEngine", "URLFetcher", "HTMLParser"]
+
+_EXPORTS = {
+    "ScanEngine": ".engine",
+    "URLFetcher": ".fetcher",
+    "HTMLParser": ".parser",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
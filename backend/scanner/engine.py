@@ -1,18 +1,23 @@
 """
 Main scan engine - orchestrates URL fetching, parsing, and WCAG checks
 """
+import asyncio
 import logging
 import uuid
-from datetime import datetime
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time
+from typing import Dict, List, Optional
+from cachetools import TTLCache
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import ScanResponse, ScanStatus, Finding
+from config import settings
+from models import ScanResponse, ScanStatus, SeverityLevel, WCAGLevel, Finding
 from database import async_session_maker, ScanRecord
 from .fetcher import URLFetcher
 from .parser import HTMLParser
 from .rules import ALL_RULES
+from .rules.base import WCAGRule
 
 logger = logging.getLogger(__name__)
 
@@ -23,31 +28,86 @@ class ScanEngine:
     def __init__(self):
         self.fetcher = URLFetcher()
         self.parser = HTMLParser()
-        self.rules = ALL_RULES
+        # Rules are stateless, so one instance of each serves every scan
+        self.rule_instances = [rule_class() for rule_class in ALL_RULES]
+        # Dedicated, fixed-size pool for rule checks, kept apart from
+        # asyncio's default executor; created by open() or lazily on first scan
+        self.rule_executor: Optional[ThreadPoolExecutor] = None
+
+        # Recently built responses by scan_id, and scans currently running by
+        # URL. Both are only touched from the event loop, so need no locking.
+        self._response_cache: TTLCache = TTLCache(
+            maxsize=settings.SCAN_CACHE_SIZE,
+            ttl=settings.SCAN_CACHE_TTL
+        )
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def open(self) -> ThreadPoolExecutor:
+        """Create the rule thread pool if it does not exist yet"""
+        if self.rule_executor is None:
+            self.rule_executor = ThreadPoolExecutor(
+                max_workers=settings.RULE_WORKERS,
+                thread_name_prefix="wcag-rule"
+            )
+        return self.rule_executor
+
+    def close(self) -> None:
+        """Shut down the rule thread pool; the next scan or open() recreates it"""
+        if self.rule_executor is not None:
+            self.rule_executor.shutdown()
+            self.rule_executor = None
 
     async def scan_url(self, url: str) -> ScanResponse:
         """
         Perform complete accessibility scan of a URL
 
+        Concurrent requests for a URL that is already being scanned wait for
+        that scan and share its result instead of starting another one.
+
         Args:
             url: URL to scan
 
         Returns:
             ScanResponse with results
         """
+        task = self._inflight.get(url)
+        if task is None:
+            # The scan runs as its own task so that cancelling any one caller,
+            # including the one that started it, leaves it running for the rest
+            task = asyncio.create_task(self._run_scan(url))
+            task.add_done_callback(lambda done: self._scan_done(url, done))
+            self._inflight[url] = task
+        else:
+            logger.info(f"Joining in-flight scan for {url}")
+
+        return await asyncio.shield(task)
+
+    def _scan_done(self, url: str, task: asyncio.Task) -> None:
+        """Retire a finished scan task and cache its response"""
+        del self._inflight[url]
+        if task.cancelled():
+            return
+        if task.exception() is None:  # Also marks a failure as retrieved
+            response = task.result()
+            self._response_cache[response.scan_id] = response
+
+    async def _run_scan(self, url: str) -> ScanResponse:
+        """Fetch, parse and check a URL, and store the result"""
         scan_id = str(uuid.uuid4())[:12]
         start_time = datetime.utcnow()
 
         try:
-            # Create database record
-            async with async_session_maker() as session:
-                scan_record = ScanRecord(
-                    scan_id=scan_id,
-                    url=url,
-                    status=ScanStatus.SCANNING.value
-                )
-                session.add(scan_record)
-                await session.commit()
+            if settings.ENABLE_PROGRESS_TRACKING:
+                # Insert the record up front so the scan can be polled while it runs
+                async with async_session_maker() as session:
+                    scan_record = ScanRecord(
+                        scan_id=scan_id,
+                        url=url,
+                        status=ScanStatus.SCANNING.value,
+                        created_at=start_time
+                    )
+                    session.add(scan_record)
+                    await session.commit()
 
             # Fetch HTML
             logger.info(f"Fetching URL: {url}")
@@ -56,32 +116,28 @@ class ScanEngine:
             # Parse HTML
             logger.info(f"Parsing HTML for scan {scan_id}")
             parsed_html = self.parser.parse(html_content)
+            if settings.DEBUG:
+                assert parsed_html.backend in WCAGRule.SUPPORTED_BACKENDS, (
+                    f"Unsupported parser backend: {parsed_html.backend}"
+                )
 
-            # Run all WCAG rules
-            logger.info(f"Running {len(self.rules)} WCAG checks")
-            findings = []
-
-            for rule_class in self.rules:
-                rule = rule_class()
-                rule_findings = rule.check(parsed_html)
-                findings.extend(rule_findings)
+            # Run all WCAG rules concurrently off the event loop; rules only
+            # read parsed_html, and gather keeps results in registry order
+            logger.info(f"Running {len(self.rule_instances)} WCAG checks")
+            loop = asyncio.get_running_loop()
+            executor = self.open()
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, rule.check, parsed_html)
+                for rule in self.rule_instances
+            ))
+            findings = [f for rule_findings in results for f in rule_findings]
 
             # Calculate metrics
             end_time = datetime.utcnow()
             duration_ms = int((end_time - start_time).total_seconds() * 1000)
 
-            passed = sum(1 for f in findings if f.severity.value == "pass")
-            warnings = sum(1 for f in findings if f.severity.value == "warning")
-            failures = sum(1 for f in findings if f.severity.value == "fail")
-            total = len(findings)
-
-            # Calculate score (100 = perfect, 0 = many failures)
-            if total > 0:
-                score = ((passed + (warnings * 0.5)) / total) * 100
-            else:
-                score = 100.0
-
-            # Count issues by principle
+            # Tally severities and issues by principle in a single pass
+            passed = warnings = failures = 0
             principle_counts = {
                 "Perceivable": 0,
                 "Operable": 0,
@@ -89,38 +145,32 @@ class ScanEngine:
                 "Robust": 0
             }
 
+            # Enum members are singletons, so identity checks suffice
             for finding in findings:
-                if finding.severity.value in ("warning", "fail"):
-                    principle_counts[finding.principle] = principle_counts.get(finding.principle, 0) + 1
+                severity = finding.severity
+                if severity is SeverityLevel.PASS:
+                    passed += 1
+                    continue
+                if severity is SeverityLevel.WARNING:
+                    warnings += 1
+                else:
+                    failures += 1
+                principle_counts[finding.principle] = principle_counts.get(finding.principle, 0) + 1
 
-            # Update database record
-            async with async_session_maker() as session:
-                result = await session.execute(
-                    select(ScanRecord).where(ScanRecord.scan_id == scan_id)
-                )
-                scan_record = result.scalar_one()
-
-                scan_record.status = ScanStatus.COMPLETE.value
-                scan_record.score = round(score, 1)
-                scan_record.findings = [f.model_dump() for f in findings]
-                scan_record.total_checks = total
-                scan_record.passed_checks = passed
-                scan_record.warnings = warnings
-                scan_record.failures = failures
-                scan_record.perceivable_issues = principle_counts["Perceivable"]
-                scan_record.operable_issues = principle_counts["Operable"]
-                scan_record.understandable_issues = principle_counts["Understandable"]
-                scan_record.robust_issues = principle_counts["Robust"]
-                scan_record.completed_at = end_time
-                scan_record.scan_duration_ms = duration_ms
-
-                await session.commit()
-
-            # Build response
-            response = ScanResponse(
-                scan_id=scan_id,
-                url=url,
-                status=ScanStatus.COMPLETE,
+            total = len(findings)
+
+            # Calculate score (100 = perfect, 0 = many failures)
+            if total > 0:
+                score = ((passed + (warnings * 0.5)) / total) * 100
+            else:
+                score = 100.0
+
+            # Store the finished scan
+            scan_record = await self._save_record(
+                scan_id,
+                url,
+                start_time,
+                status=ScanStatus.COMPLETE.value,
                 score=round(score, 1),
                 findings=findings,
                 total_checks=total,
@@ -131,31 +181,103 @@ class ScanEngine:
                 operable_issues=principle_counts["Operable"],
                 understandable_issues=principle_counts["Understandable"],
                 robust_issues=principle_counts["Robust"],
-                created_at=start_time,
                 completed_at=end_time,
                 scan_duration_ms=duration_ms
             )
 
+            response = self._build_response(scan_record, findings)
+
             logger.info(f"Scan {scan_id} complete - Score: {score:.1f}")
             return response
 
         except Exception as e:
             logger.error(f"Scan {scan_id} failed: {str(e)}")
 
-            # Update database with error
-            async with async_session_maker() as session:
+            # Record the error
+            await self._save_record(
+                scan_id,
+                url,
+                start_time,
+                status=ScanStatus.FAILED.value,
+                error_message=str(e),
+                completed_at=datetime.utcnow()
+            )
+
+            raise
+
+    async def _save_record(self, scan_id: str, url: str, created_at: datetime, **fields) -> ScanRecord:
+        """
+        Persist the final state of a scan
+
+        Normally this is the only write for a scan: a single INSERT. With
+        ENABLE_PROGRESS_TRACKING the row already exists and is updated instead.
+
+        Args:
+            scan_id: Scan identifier
+            url: Scanned URL
+            created_at: When the scan started
+            **fields: ScanRecord columns to set
+
+        Returns:
+            The stored ScanRecord
+        """
+        async with async_session_maker() as session:
+            scan_record = None
+            if settings.ENABLE_PROGRESS_TRACKING:
                 result = await session.execute(
                     select(ScanRecord).where(ScanRecord.scan_id == scan_id)
                 )
                 scan_record = result.scalar_one_or_none()
 
-                if scan_record:
-                    scan_record.status = ScanStatus.FAILED.value
-                    scan_record.error_message = str(e)
-                    scan_record.completed_at = datetime.utcnow()
-                    await session.commit()
+            if scan_record is None:
+                scan_record = ScanRecord(scan_id=scan_id, url=url, created_at=created_at)
+                session.add(scan_record)
 
-            raise
+            for key, value in fields.items():
+                setattr(scan_record, key, value)
+
+            await session.commit()
+
+        return scan_record
+
+    @staticmethod
+    def _build_response(scan_record: ScanRecord, findings: List[Finding]) -> ScanResponse:
+        """
+        Build the API response for a stored scan
+
+        The record only holds values we computed and stored ourselves, so the
+        response is assembled with model_construct() and skips validation.
+        """
+        return ScanResponse.model_construct(
+            scan_id=scan_record.scan_id,
+            url=scan_record.url,
+            status=ScanStatus(scan_record.status),
+            score=scan_record.score,
+            findings=findings,
+            total_checks=scan_record.total_checks,
+            passed_checks=scan_record.passed_checks,
+            warnings=scan_record.warnings,
+            failures=scan_record.failures,
+            perceivable_issues=scan_record.perceivable_issues,
+            operable_issues=scan_record.operable_issues,
+            understandable_issues=scan_record.understandable_issues,
+            robust_issues=scan_record.robust_issues,
+            created_at=scan_record.created_at,
+            completed_at=scan_record.completed_at,
+            scan_duration_ms=scan_record.scan_duration_ms
+        )
+
+    @staticmethod
+    def _finding_from_json(data: dict) -> Finding:
+        """
+        Rebuild a Finding from its stored JSON without revalidating it
+
+        These dicts were produced from validated Findings, so only the enum
+        fields need converting back before model_construct().
+        """
+        data["severity"] = SeverityLevel(data["severity"])
+        data["wcag_level"] = WCAGLevel(data["wcag_level"])
+        return Finding.model_construct(**data)
 
     async def get_scan(self, scan_id: str) -> Optional[ScanResponse]:
         """
@@ -167,6 +289,10 @@ class ScanEngine:
         Returns:
             ScanResponse or None if not found
         """
+        cached = self._response_cache.get(scan_id)
+        if cached is not None:
+            return cached
+
         async with async_session_maker() as session:
             result = await session.execute(
                 select(ScanRecord).where(ScanRecord.scan_id == scan_id)
@@ -179,56 +305,37 @@ class ScanEngine:
             # Convert findings from JSON to Finding objects
             findings = []
             if scan_record.findings:
-                findings = [Finding(**f) for f in scan_record.findings]
+                findings = [self._finding_from_json(f) for f in scan_record.findings]
 
-            return ScanResponse(
-                scan_id=scan_record.scan_id,
-                url=scan_record.url,
-                status=ScanStatus(scan_record.status),
-                score=scan_record.score,
-                findings=findings,
-                total_checks=scan_record.total_checks,
-                passed_checks=scan_record.passed_checks,
-                warnings=scan_record.warnings,
-                failures=scan_record.failures,
-                perceivable_issues=scan_record.perceivable_issues,
-                operable_issues=scan_record.operable_issues,
-                understandable_issues=scan_record.understandable_issues,
-                robust_issues=scan_record.robust_issues,
-                created_at=scan_record.created_at,
-                completed_at=scan_record.completed_at,
-                scan_duration_ms=scan_record.scan_duration_ms
-            )
+            response = self._build_response(scan_record, findings)
+
+        # A scan that is still running may change, so only cache finished ones
+        if response.status in (ScanStatus.COMPLETE, ScanStatus.FAILED):
+            self._response_cache[scan_id] = response
+
+        return response
 
     async def get_stats(self) -> dict:
         """Get overall statistics"""
-        async with async_session_maker() as session:
-            # Total scans
-            total_result = await session.execute(
-                select(func.count(ScanRecord.id))
-            )
-            total_scans = total_result.scalar()
-
-            # Today's scans
-            today = datetime.utcnow().date()
-            today_result = await session.execute(
-                select(func.count(ScanRecord.id)).where(
-                    func.date(ScanRecord.created_at) == today
-                )
-            )
-            scans_today = today_result.scalar()
+        # Compare against the start of today rather than date(created_at) so
+        # the created_at index can be used
+        today_start = datetime.combine(datetime.utcnow().date(), time.min)
 
-            # Average score
-            avg_result = await session.execute(
-                select(func.avg(ScanRecord.score)).where(
-                    ScanRecord.score.isnot(None)
+        async with async_session_maker() as session:
+            # Total scans, today's scans and average score in one round-trip
+            # (AVG ignores scans without a score)
+            result = await session.execute(
+                select(
+                    func.count(ScanRecord.id),
+                    func.count(ScanRecord.id).filter(ScanRecord.created_at >= today_start),
+                    func.avg(ScanRecord.score)
                 )
             )
-            average_score = avg_result.scalar() or 0.0
+            total_scans, scans_today, average_score = result.one()
 
             return {
                 "total_scans": total_scans or 0,
                 "scans_today": scans_today or 0,
-                "average_score": round(average_score, 1),
+                "average_score": round(average_score or 0.0, 1),
                 "common_issues": []  # TODO: Implement
             }
@@ -1,12 +1,96 @@
 """
 URL Fetcher - Handles async HTTP requests with safety constraints
 """
+import asyncio
 import httpx
 import logging
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, List, Optional
+from cachetools import TTLCache
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Bytes read per iteration while streaming a response body
+CHUNK_SIZE = 64 * 1024
+
+# How long (seconds) an idle host keeps a reduced limit, and how many such
+# hosts are remembered
+THROTTLED_HOST_TTL = 600
+THROTTLED_HOST_CACHE_SIZE = 1024
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit that adapts with AIMD (additive increase, multiplicative decrease)
+
+    After a fast successful fetch the limit grows by `increase`; after a 429,
+    5xx or timeout it is multiplied by `decrease`. "Fast" means no slower
+    than twice the median of the recent latency window. The limit stays
+    within [min_limit, max_limit].
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        window: int = 32
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.limit = float(max_limit)
+        self.active = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def _has_capacity(self) -> bool:
+        return self.active < int(self.limit)
+
+    async def acquire(self) -> None:
+        """Wait for a free slot"""
+        if not self._waiters and self._has_capacity():
+            self.active += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we were cancelled; give it back
+                self.active -= 1
+                self._wake()
+            raise
+
+    def release(self, overloaded: bool, latency: float) -> None:
+        """Free a slot and adjust the limit from the outcome of the fetch"""
+        self.active -= 1
+
+        if overloaded:
+            self.limit = max(self.min_limit, self.limit * self.decrease)
+        else:
+            if not self._latencies or latency <= 2 * statistics.median(self._latencies):
+                self.limit = min(self.max_limit, self.limit + self.increase)
+            self._latencies.append(latency)
+
+        self._wake()
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters in FIFO order"""
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
 
 class URLFetcher:
     """Async URL fetcher with safety limits"""
@@ -15,6 +99,66 @@ class URLFetcher:
         self.timeout = httpx.Timeout(settings.REQUEST_TIMEOUT)
         self.max_size = settings.MAX_HTML_SIZE_MB * 1024 * 1024  # Convert MB to bytes
         self.max_redirects = settings.MAX_REDIRECTS
+        self.headers = {
+            "User-Agent": settings.USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9,de;q=0.8",
+            "Accept-Encoding": "gzip, deflate"
+        }
+        # Shared client, so connections, TLS sessions and HTTP/2 streams are
+        # reused across scans; created by open() or lazily on first fetch
+        self.client: Optional[httpx.AsyncClient] = None
+
+        # Backpressure: a fixed global cap plus an adaptive limit per host.
+        # Overload signals (429, 5xx, timeouts) only ever throttle the host
+        # that sent them, so one failing site cannot slow down the others.
+        self.global_slots = asyncio.Semaphore(settings.FETCH_MAX_CONCURRENCY)
+        self.host_limit = settings.FETCH_PER_HOST_CONCURRENCY
+        self._host_slots: Dict[str, List] = {}  # host -> [AIMDLimiter, users]
+        # Idle hosts whose limit is still reduced, so a new scan does not
+        # reset the limit of a host that was just overloaded
+        self._throttled_hosts: TTLCache = TTLCache(
+            maxsize=THROTTLED_HOST_CACHE_SIZE,
+            ttl=THROTTLED_HOST_TTL
+        )
+
+    def open(self) -> httpx.AsyncClient:
+        """Create the shared HTTP client if it does not exist yet"""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                max_redirects=self.max_redirects,
+                headers=self.headers,
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self.client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    @asynccontextmanager
+    async def _host_limiter(self, host: str):
+        """Yield the host's AIMD limiter; idle hosts at full limit are forgotten"""
+        slot = self._host_slots.get(host)
+        if slot is None:
+            limiter = self._throttled_hosts.pop(host, None)
+            if limiter is None:
+                limiter = AIMDLimiter(max_limit=self.host_limit)
+            slot = self._host_slots[host] = [limiter, 0]
+        slot[1] += 1
+        try:
+            yield slot[0]
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0:
+                del self._host_slots[host]
+                if slot[0].limit < slot[0].max_limit:
+                    self._throttled_hosts[host] = slot[0]
 
     async def fetch(self, url: str) -> str:
         """
@@ -30,48 +174,66 @@ class URLFetcher:
             httpx.HTTPError: On HTTP errors
             ValueError: If content too large or invalid
         """
-        headers = {
-            "User-Agent": settings.USER_AGENT,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9,de;q=0.8",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive"
-        }
+        client = self.open()
+        host = httpx.URL(url).host
 
-        async with httpx.AsyncClient(
-            timeout=self.timeout,
-            follow_redirects=True,
-            max_redirects=self.max_redirects
-        ) as client:
+        async with self._host_limiter(host) as limiter:
+            await limiter.acquire()
+            started = time.monotonic()
+            overloaded = False
             try:
-                logger.info(f"Fetching URL: {url}")
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-
-                # Check content type
-                content_type = response.headers.get("content-type", "")
-                if "text/html" not in content_type:
-                    raise ValueError(f"Invalid content type: {content_type}. Expected text/html")
-
-                # Check content size
-                content_length = len(response.content)
-                if content_length > self.max_size:
-                    raise ValueError(
-                        f"Content too large: {content_length / 1024 / 1024:.1f} MB "
-                        f"(max: {settings.MAX_HTML_SIZE_MB} MB)"
-                    )
-
-                logger.info(f"Successfully fetched {content_length / 1024:.1f} KB from {url}")
-                return response.text
+                async with self.global_slots:
+                    started = time.monotonic()  # Time the fetch, not the wait
+                    logger.info(f"Fetching URL: {url}")
+                    return await self._download(client, url)
 
             except httpx.TimeoutException:
+                overloaded = True
                 logger.error(f"Timeout fetching {url}")
                 raise ValueError(f"Request timeout after {settings.REQUEST_TIMEOUT} seconds")
 
             except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error {e.response.status_code} for {url}")
-                raise ValueError(f"HTTP {e.response.status_code}: {e.response.reason_phrase}")
+                status = e.response.status_code
+                overloaded = status == 429 or status >= 500
+                logger.error(f"HTTP error {status} for {url}")
+                raise ValueError(f"HTTP {status}: {e.response.reason_phrase}")
 
             except httpx.RequestError as e:
                 logger.error(f"Request error for {url}: {str(e)}")
                 raise ValueError(f"Failed to fetch URL: {str(e)}")
+
+            finally:
+                limiter.release(overloaded, time.monotonic() - started)
+
+    async def _download(self, client: httpx.AsyncClient, url: str) -> str:
+        """Stream the page body, enforcing content type and size limits"""
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+
+            # Check content type
+            content_type = response.headers.get("content-type", "")
+            if "text/html" not in content_type:
+                raise ValueError(f"Invalid content type: {content_type}. Expected text/html")
+
+            # Reject up front if the server announces an oversized body
+            declared_length = response.headers.get("content-length", "")
+            if declared_length.isdigit() and int(declared_length) > self.max_size:
+                raise ValueError(self._too_large_message(int(declared_length)))
+
+            # Read the body in chunks, stopping as soon as it exceeds the limit
+            body = bytearray()
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                body.extend(chunk)
+                if len(body) > self.max_size:
+                    raise ValueError(self._too_large_message(len(body)))
+
+            content_length = len(body)
+            logger.info(f"Successfully fetched {content_length / 1024:.1f} KB from {url}")
+            return body.decode(response.encoding or "utf-8", errors="replace")
+
+    def _too_large_message(self, size: int) -> str:
+        """Error message for a body over the size limit"""
+        return (
+            f"Content too large: {size / 1024 / 1024:.1f} MB "
+            f"(max: {settings.MAX_HTML_SIZE_MB} MB)"
+        )
@@ -1,88 +1,319 @@
 """
 HTML Parser - Parses HTML and provides convenient access to elements
+
+Documents are parsed with selectolax's Lexbor engine (C). If Lexbor fails on a
+document we fall back to lxml.html. Either way the rules only ever see the
+lightweight Element view defined below.
 """
-from bs4 import BeautifulSoup
-from typing import List, Optional
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import logging
 
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from selectolax.lexbor import LexborHTMLParser
+
 logger = logging.getLogger(__name__)
 
 
-class ParsedHTML:
-    """Wrapper for parsed HTML with convenience methods"""
+class Element(ABC):
+    """
+    Lightweight view over a parsed node
 
-    def __init__(self, soup: BeautifulSoup, raw_html: str):
-        self.soup = soup
-        self.raw_html = raw_html
+    Mirrors the small subset of the BeautifulSoup Tag API used by the WCAG
+    rules (name, attrs, get, get_text, parent, find and str()).
+    """
 
-    def find_all(self, tag: str, **kwargs) -> List:
-        """Find all elements matching tag and attributes"""
-        return self.soup.find_all(tag, **kwargs)
+    __slots__ = ("node", "name", "attrs")
 
-    def find(self, tag: str, **kwargs) -> Optional:
-        """Find first element matching tag and attributes"""
-        return self.soup.find(tag, **kwargs)
+    def __init__(self, node, name: str, attrs: Dict[str, str]):
+        self.node = node
+        self.name = name
+        self.attrs = attrs
 
-    def get_text(self) -> str:
-        """Get all text content"""
-        return self.soup.get_text()
+    def get(self, key: str, default=None):
+        """Get attribute value"""
+        return self.attrs.get(key, default)
 
-    @property
-    def html_tag(self):
-        """Get <html> tag"""
-        return self.soup.find('html')
+    @abstractmethod
+    def get_text(self, strip: bool = False) -> str:
+        """Get text content of the element and its descendants (trimmed if strip)"""
 
     @property
-    def title(self) -> Optional[str]:
-        """Get page title"""
-        title_tag = self.soup.find('title')
-        return title_tag.get_text().strip() if title_tag else None
+    @abstractmethod
+    def parent(self) -> Optional["Element"]:
+        """Get parent element"""
 
-    @property
-    def images(self) -> List:
-        """Get all <img> tags"""
-        return self.soup.find_all('img')
+    @abstractmethod
+    def find(self, tag: str) -> Optional["Element"]:
+        """Find first descendant matching tag"""
 
-    @property
-    def links(self) -> List:
-        """Get all <a> tags"""
-        return self.soup.find_all('a')
+    def __repr__(self) -> str:
+        return f"<Element {self.name}>"
 
-    @property
-    def forms(self) -> List:
-        """Get all <form> tags"""
-        return self.soup.find_all('form')
+
+class _LexborElement(Element):
+    """Element backed by a selectolax LexborNode"""
+
+    __slots__ = ()
+
+    def __init__(self, node):
+        # Boolean attributes come back as None; BeautifulSoup reported them as ''
+        attrs = {k: ('' if v is None else v) for k, v in node.attributes.items()}
+        super().__init__(node, node.tag, attrs)
+
+    def get_text(self, strip: bool = False) -> str:
+        text = self.node.text(deep=True)
+        return text.strip() if strip else text
 
     @property
-    def inputs(self) -> List:
-        """Get all input elements"""
-        return self.soup.find_all(['input', 'textarea', 'select'])
+    def parent(self) -> Optional[Element]:
+        parent = self.node.parent
+        if parent is None or parent.tag == "#document":
+            return None
+        return _LexborElement(parent)
+
+    def find(self, tag: str) -> Optional[Element]:
+        node = self.node
+        for match in node.css(tag):
+            # Lexbor matches the node itself too; only descendants count
+            if match != node:
+                return _LexborElement(match)
+        return None
+
+    def __str__(self) -> str:
+        return self.node.html
+
+
+class _LxmlElement(Element):
+    """Element backed by an lxml.html element (fallback parser)"""
+
+    __slots__ = ()
+
+    def __init__(self, node):
+        super().__init__(node, node.tag, dict(node.attrib))
+
+    def get_text(self, strip: bool = False) -> str:
+        text = self.node.text_content()
+        return text.strip() if strip else text
 
     @property
-    def headings(self) -> List:
-        """Get all heading tags (h1-h6)"""
-        return self.soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+    def parent(self) -> Optional[Element]:
+        parent = self.node.getparent()
+        return _LxmlElement(parent) if parent is not None else None
+
+    def find(self, tag: str) -> Optional[Element]:
+        node = self.node.find(f".//{tag}")
+        return _LxmlElement(node) if node is not None else None
+
+    def __str__(self) -> str:
+        return etree.tostring(self.node, encoding="unicode", method="html", with_tail=False)
+
+
+def _selector_for(tag, attrs: Dict) -> str:
+    """Translate a BeautifulSoup-style (tag, attrs) query into a CSS selector"""
+    if tag is None:
+        tags = ("*",)
+    elif isinstance(tag, str):
+        tags = (tag,)
+    else:
+        tags = tuple(tag)
+    return _build_selector(tags, tuple(attrs.items()))
+
+
+@lru_cache(maxsize=256)
+def _build_selector(tags: Tuple[str, ...], attrs: Tuple[Tuple[str, object], ...]) -> str:
+    """Build (and memoize) the CSS selector for a normalized query"""
+    suffix = ""
+    for key, value in attrs:
+        if value is True:
+            suffix += f"[{key}]"
+        else:
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            suffix += f'[{key}="{escaped}"]'
+
+    return ", ".join(t + suffix for t in tags)
+
+
+@lru_cache(maxsize=64)
+def _compiled_selector(selector: str) -> CSSSelector:
+    """Compile (and memoize) a CSS selector for the lxml backend"""
+    # cssselect translates CSS to XPath in Python, so pay for it once per selector
+    return CSSSelector(selector, translator="html")
+
+
+def _normalize_role(role: str) -> str:
+    """Strip and lowercase a role value, reusing it when already canonical"""
+    # islower() is False for '', so role[0] and role[-1] exist here
+    if role.islower() and not role[0].isspace() and not role[-1].isspace():
+        return role
+    return role.strip().lower()
+
+
+_INPUT_TAGS = frozenset({'input', 'textarea', 'select'})
+_HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+
+
+class ParsedHTML:
+    """
+    Wrapper for parsed HTML with convenience methods
+
+    The tree is walked exactly once on construction and the elements the
+    rules care about are bucketed into plain lists, so every rule reads a
+    prebuilt list instead of re-traversing the DOM.
+    """
+
+    def __init__(self, tree, raw_html: str, backend: str = "lexbor"):
+        self.tree = tree
+        self.raw_html = raw_html
+        self.backend = backend
+
+        self.html_tag: Optional[Element] = None
+        self.title_tag: Optional[Element] = None
+        self.images: List[Element] = []
+        self.links: List[Element] = []
+        self.forms: List[Element] = []
+        self.inputs: List[Element] = []
+        self.inputs_typed: List[Tuple[Element, str]] = []  # (input, lowercased type)
+        self.headings: List[Element] = []
+        self.h1_elements: List[Element] = []
+        self.buttons: List[Element] = []
+        self.labels_by_for: Dict[str, Element] = {}  # for-attribute -> first such label
+        self.elements_with_id: List[Element] = []
+        self.elements_with_role: List[Element] = []
+        self.roles_lowered: List[Tuple[Element, str]] = []  # (element, normalized role)
+        self.elements_with_aria: List[Element] = []
+
+        self._index()
+
+    def _iter_elements(self):
+        """Yield every element of the tree in document order"""
+        if self.backend == "lexbor":
+            root = self.tree.root
+            if root is not None:
+                for node in root.traverse():
+                    # Skip comments (and text nodes): reading .attributes on
+                    # them crashes selectolax 0.3.x outright
+                    if node.tag.startswith('-'):
+                        continue
+                    yield _LexborElement(node)
+        else:
+            for node in self.tree.iter():
+                # Skip comments and processing instructions
+                if isinstance(node.tag, str):
+                    yield _LxmlElement(node)
+
+    def _index(self):
+        """Single pass over the tree filling the element buckets"""
+        images = self.images
+        links = self.links
+        forms = self.forms
+        inputs = self.inputs
+        inputs_typed = self.inputs_typed
+        headings = self.headings
+        h1_elements = self.h1_elements
+        buttons = self.buttons
+        labels_by_for = self.labels_by_for
+        with_id = self.elements_with_id
+        with_role = self.elements_with_role
+        roles_lowered = self.roles_lowered
+        with_aria = self.elements_with_aria
+
+        for elem in self._iter_elements():
+            name = elem.name
+            attrs = elem.attrs
+
+            if name == 'img':
+                images.append(elem)
+            elif name == 'a':
+                links.append(elem)
+            elif name in _INPUT_TAGS:
+                inputs.append(elem)
+                inputs_typed.append((elem, attrs.get('type', 'text').lower()))
+                if name == 'input' and attrs.get('type') == 'button':
+                    buttons.append(elem)
+            elif name in _HEADING_TAGS:
+                headings.append(elem)
+                if name == 'h1':
+                    h1_elements.append(elem)
+            elif name == 'button':
+                buttons.append(elem)
+            elif name == 'form':
+                forms.append(elem)
+            elif name == 'label':
+                for_id = attrs.get('for')
+                if for_id and for_id not in labels_by_for:
+                    labels_by_for[for_id] = elem
+            elif name == 'html':
+                if self.html_tag is None:
+                    self.html_tag = elem
+            elif name == 'title':
+                if self.title_tag is None:
+                    self.title_tag = elem
+
+            if attrs:
+                if 'id' in attrs:
+                    with_id.append(elem)
+                if 'role' in attrs:
+                    with_role.append(elem)
+                    roles_lowered.append((elem, _normalize_role(attrs['role'])))
+                for key in attrs:
+                    if key.startswith('aria-'):
+                        with_aria.append(elem)
+                        break
+
+    def _css(self, selector: str) -> List[Element]:
+        """Run a CSS query against the underlying tree"""
+        if self.backend == "lexbor":
+            return [_LexborElement(n) for n in self.tree.css(selector)]
+        return [_LxmlElement(n) for n in _compiled_selector(selector)(self.tree)]
+
+    def _css_first(self, selector: str) -> Optional[Element]:
+        """Run a CSS query and return the first match"""
+        if self.backend == "lexbor":
+            node = self.tree.css_first(selector)
+            return _LexborElement(node) if node is not None else None
+        matches = _compiled_selector(selector)(self.tree)
+        return _LxmlElement(matches[0]) if matches else None
+
+    def find_all(self, tag, attrs: Optional[Dict] = None, **kwargs) -> List[Element]:
+        """Find all elements matching tag and attributes"""
+        return self._css(_selector_for(tag, {**(attrs or {}), **kwargs}))
+
+    def find(self, tag, attrs: Optional[Dict] = None, **kwargs) -> Optional[Element]:
+        """Find first element matching tag and attributes"""
+        return self._css_first(_selector_for(tag, {**(attrs or {}), **kwargs}))
+
+    def get_text(self) -> str:
+        """Get all text content"""
+        return self.html_tag.get_text() if self.html_tag else ""
 
     @property
-    def buttons(self) -> List:
-        """Get all buttons"""
-        return self.soup.find_all(['button']) + self.soup.find_all('input', type='button')
+    def title(self) -> Optional[str]:
+        """Get page title"""
+        return self.title_tag.get_text(strip=True) if self.title_tag else None
 
-    def get_elements_with_role(self, role: str) -> List:
+    def get_elements_with_role(self, role: str) -> List[Element]:
         """Get all elements with specific ARIA role"""
-        return self.soup.find_all(attrs={"role": role})
+        return [elem for elem in self.elements_with_role if elem.attrs['role'] == role]
 
-    def get_elements_with_aria_attribute(self, attr: str) -> List:
+    def get_elements_with_aria_attribute(self, attr: str) -> List[Element]:
         """Get all elements with specific ARIA attribute"""
-        return self.soup.find_all(attrs={attr: True})
+        if attr == 'role':
+            return self.elements_with_role
+        if attr.startswith('aria-'):
+            return [elem for elem in self.elements_with_aria if attr in elem.attrs]
+        return self.find_all(None, attrs={attr: True})
 
     def get_all_ids(self) -> List[str]:
         """Get all ID attributes"""
-        return [elem.get('id') for elem in self.soup.find_all(id=True)]
+        return [elem.attrs['id'] for elem in self.elements_with_id]
 
 
 class HTMLParser:
-    """HTML parser using BeautifulSoup"""
+    """HTML parser using selectolax (Lexbor), with lxml as fallback"""
 
     def parse(self, html: str) -> ParsedHTML:
         """
@@ -95,12 +326,12 @@ class HTMLParser:
             ParsedHTML object with convenience methods
         """
         try:
-            soup = BeautifulSoup(html, 'lxml')
+            tree = LexborHTMLParser(html)
             logger.info(f"Successfully parsed HTML ({len(html)} chars)")
-            return ParsedHTML(soup, html)
+            return ParsedHTML(tree, html, backend="lexbor")
         except Exception as e:
             logger.error(f"Failed to parse HTML: {str(e)}")
-            # Fallback to html.parser
-            soup = BeautifulSoup(html, 'html.parser')
-            logger.info("Parsed with fallback html.parser")
-            return ParsedHTML(soup, html)
+            # Fallback to lxml.html
+            tree = lxml.html.document_fromstring(html or "<html></html>")
+            logger.info("Parsed with fallback lxml.html")
+            return ParsedHTML(tree, html, backend="lxml")
@@ -2,9 +2,12 @@
 WCAG 2.1 Rules - Base classes and rule registry
 """
 from abc import ABC, abstractmethod
-from typing import List
+from typing import TYPE_CHECKING, ClassVar, FrozenSet, List, Optional
 from models import Finding, SeverityLevel, WCAGLevel
 
+if TYPE_CHECKING:
+    from ..parser import ParsedHTML
+
 
 class WCAGRule(ABC):
     """Base class for all WCAG rules"""
@@ -15,13 +18,21 @@ class WCAGRule(ABC):
     wcag_level: WCAGLevel = WCAGLevel.AA
     principle: str = ""
 
+    # Parser backends the rules are written against. Both build the tree in C
+    # (selectolax/Lexbor, with lxml as fallback); ScanEngine asserts this in
+    # DEBUG mode so a pure-Python parser does not sneak in unnoticed.
+    SUPPORTED_BACKENDS: ClassVar[FrozenSet[str]] = frozenset({"lexbor", "lxml"})
+
     @abstractmethod
-    def check(self, parsed_html) -> List[Finding]:
+    def check(self, parsed_html: "ParsedHTML") -> List[Finding]:
         """
         Execute the rule check
 
+        Rules of a scan run concurrently on a thread pool against the same
+        ParsedHTML, which must be treated as read-only.
+
         Args:
-            parsed_html: ParsedHTML object
+            parsed_html: ParsedHTML object (see SUPPORTED_BACKENDS)
 
         Returns:
             List of Finding objects
@@ -33,7 +44,7 @@ class WCAGRule(ABC):
         severity: SeverityLevel,
         message: str,
         remediation: str,
-        element: str = None,
+        element: Optional[str] = None,
         count: int = 1
     ) -> Finding:
         """Helper to create Finding object"""
@@ -2,10 +2,22 @@
 WCAG Rules for Operable principle
 Success criteria related to making interface components operable
 """
-from typing import List
+from typing import TYPE_CHECKING, ClassVar, FrozenSet, List
 from models import Finding, SeverityLevel, WCAGLevel
 from .base import WCAGRule
 
+if TYPE_CHECKING:
+    from ..parser import Element, ParsedHTML
+
+# Link texts that say nothing about the link target
+_VAGUE_LINK_TEXTS = frozenset({'click here', 'read more', 'more', 'here', 'link'})
+
+
+def _wrapped_in_label(elem: "Element") -> bool:
+    """Whether the element's parent is a <label>"""
+    parent = elem.parent
+    return parent is not None and parent.name == 'label'
+
 
 class FormLabelRule(WCAGRule):
     """1.3.1 & 3.3.2 - Form inputs must have labels"""
@@ -15,65 +27,62 @@ class FormLabelRule(WCAGRule):
     wcag_level = WCAGLevel.AA
     principle = "Operable"
 
-    def check(self, parsed_html) -> List[Finding]:
-        inputs = parsed_html.inputs
-        unlabeled = []
+    # Input types that need no label
+    _SKIP_TYPES: ClassVar[FrozenSet[str]] = frozenset({'hidden', 'submit', 'button', 'reset'})
 
-        for input_elem in inputs:
-            # Skip hidden inputs and buttons
-            input_type = input_elem.get('type', 'text').lower()
-            if input_type in ['hidden', 'submit', 'button', 'reset']:
-                continue
+    def check(self, parsed_html: "ParsedHTML") -> List[Finding]:
+        inputs = parsed_html.inputs
+        if not inputs:
+            return [self.create_finding(
+                severity=SeverityLevel.PASS,
+                message="No form inputs found on page",
+                remediation="N/A - No inputs to check"
+            )]
 
-            # Check for associated label
-            input_id = input_elem.get('id')
-            has_label = False
+        unlabeled: List["Element"] = []
 
-            # Check for label with for attribute
-            if input_id:
-                label = parsed_html.find('label', attrs={'for': input_id})
-                if label:
-                    has_label = True
+        # Ids that some <label for=...> points at, collected at parse time
+        labels_by_for = parsed_html.labels_by_for
+        skip_types = self._SKIP_TYPES
 
-            # Check if input is wrapped in label
-            if not has_label:
-                parent = input_elem.parent
-                if parent and parent.name == 'label':
-                    has_label = True
+        # Types come lowercased from the parse-time pass
+        for input_elem, input_type in parsed_html.inputs_typed:
+            attrs = input_elem.attrs
 
-            # Check for aria-label or aria-labelledby
-            if not has_label:
-                if input_elem.get('aria-label') or input_elem.get('aria-labelledby'):
-                    has_label = True
+            # Skip hidden inputs and buttons
+            if input_type in skip_types:
+                continue
 
-            # Check for title attribute (not ideal but acceptable)
-            if not has_label:
-                if input_elem.get('title'):
-                    has_label = True
+            # A <label for=...>, aria-label/aria-labelledby, a title (not
+            # ideal but acceptable), or a wrapping <label>. The parent is
+            # checked last since it is the only test that builds an Element.
+            input_id = attrs.get('id')
+            has_label = (
+                (bool(input_id) and input_id in labels_by_for)
+                or bool(attrs.get('aria-label'))
+                or bool(attrs.get('aria-labelledby'))
+                or bool(attrs.get('title'))
+                or _wrapped_in_label(input_elem)
+            )
 
             if not has_label:
-                unlabeled.append(str(input_elem)[:100])
+                unlabeled.append(input_elem)
 
         if unlabeled:
+            n_bad = len(unlabeled)
             return [self.create_finding(
                 severity=SeverityLevel.FAIL,
-                message=f"{len(unlabeled)} form inputs missing labels",
+                message=f"{n_bad} form inputs missing labels",
                 remediation="Add <label> elements with 'for' attribute, or use aria-label",
-                element=unlabeled[0] if unlabeled else None,
-                count=len(unlabeled)
+                element=str(unlabeled[0])[:100],
+                count=n_bad
             )]
-        elif len(inputs) > 0:
+        else:
             return [self.create_finding(
                 severity=SeverityLevel.PASS,
                 message=f"All {len(inputs)} form inputs have labels",
                 remediation="N/A - Check passed"
             )]
-        else:
-            return [self.create_finding(
-                severity=SeverityLevel.PASS,
-                message="No form inputs found on page",
-                remediation="N/A - No inputs to check"
-            )]
 
 
 class ButtonAccessibleNameRule(WCAGRule):
@@ -84,57 +93,47 @@ class ButtonAccessibleNameRule(WCAGRule):
     wcag_level = WCAGLevel.AA
     principle = "Operable"
 
-    def check(self, parsed_html) -> List[Finding]:
+    def check(self, parsed_html: "ParsedHTML") -> List[Finding]:
         buttons = parsed_html.buttons
-        unnamed = []
-
-        for btn in buttons:
-            has_name = False
-
-            # Check text content
-            text = btn.get_text().strip()
-            if text:
-                has_name = True
-
-            # Check value attribute (for input buttons)
-            if not has_name and btn.get('value'):
-                has_name = True
-
-            # Check aria-label
-            if not has_name and btn.get('aria-label'):
-                has_name = True
+        if not buttons:
+            return [self.create_finding(
+                severity=SeverityLevel.PASS,
+                message="No buttons found on page",
+                remediation="N/A - No buttons to check"
+            )]
 
-            # Check aria-labelledby
-            if not has_name and btn.get('aria-labelledby'):
-                has_name = True
+        unnamed: List["Element"] = []
 
-            # Check title
-            if not has_name and btn.get('title'):
-                has_name = True
+        for btn in buttons:
+            # Text content, or value (input buttons), aria-label,
+            # aria-labelledby or title
+            attrs = btn.attrs
+            has_name = (
+                bool(btn.get_text(strip=True))
+                or bool(attrs.get('value'))
+                or bool(attrs.get('aria-label'))
+                or bool(attrs.get('aria-labelledby'))
+                or bool(attrs.get('title'))
+            )
 
             if not has_name:
-                unnamed.append(str(btn)[:100])
+                unnamed.append(btn)
 
         if unnamed:
+            n_bad = len(unnamed)
             return [self.create_finding(
                 severity=SeverityLevel.FAIL,
-                message=f"{len(unnamed)} buttons missing accessible names",
+                message=f"{n_bad} buttons missing accessible names",
                 remediation="Add text content, value, aria-label, or title to buttons",
-                element=unnamed[0] if unnamed else None,
-                count=len(unnamed)
+                element=str(unnamed[0])[:100],
+                count=n_bad
             )]
-        elif len(buttons) > 0:
+        else:
             return [self.create_finding(
                 severity=SeverityLevel.PASS,
                 message=f"All {len(buttons)} buttons have accessible names",
                 remediation="N/A - Check passed"
             )]
-        else:
-            return [self.create_finding(
-                severity=SeverityLevel.PASS,
-                message="No buttons found on page",
-                remediation="N/A - No buttons to check"
-            )]
 
 
 class LinkTextRule(WCAGRule):
@@ -145,64 +144,63 @@ class LinkTextRule(WCAGRule):
     wcag_level = WCAGLevel.AA
     principle = "Operable"
 
-    def check(self, parsed_html) -> List[Finding]:
+    def check(self, parsed_html: "ParsedHTML") -> List[Finding]:
         links = parsed_html.links
-        empty_links = []
-        vague_links = []
-        vague_texts = ['click here', 'read more', 'more', 'here', 'link']
-
-        for link in links:
-            # Get link text
-            text = link.get_text().strip().lower()
-
-            # Check for aria-label
-            aria_label = link.get('aria-label', '').strip()
+        if not links:
+            return [self.create_finding(
+                severity=SeverityLevel.PASS,
+                message="No links found on page",
+                remediation="N/A - No links to check"
+            )]
 
-            # Check for images inside link
-            img = link.find('img')
-            img_alt = ''
-            if img:
-                img_alt = img.get('alt', '').strip()
+        empty_links: List["Element"] = []
+        vague_links: List["Element"] = []
+        vague_texts = _VAGUE_LINK_TEXTS
 
-            # Determine if link has meaningful text
-            effective_text = text or aria_label or img_alt
+        for link in links:
+            # Link text, else aria-label, else the alt of an image inside.
+            # Only text is lowercased, and only once we know it is there.
+            text = link.get_text(strip=True)
+            if text:
+                effective_text = text.lower()
+            else:
+                effective_text = link.attrs.get('aria-label', '').strip()
+                if not effective_text:
+                    img = link.find('img')
+                    effective_text = img.attrs.get('alt', '').strip() if img else ''
 
             if not effective_text:
-                empty_links.append(str(link)[:100])
+                empty_links.append(link)
             elif effective_text in vague_texts:
-                vague_links.append(str(link)[:100])
+                vague_links.append(link)
 
-        findings = []
+        findings: List[Finding] = []
 
         if empty_links:
+            n_empty = len(empty_links)
             findings.append(self.create_finding(
                 severity=SeverityLevel.FAIL,
-                message=f"{len(empty_links)} links have no text or accessible name",
+                message=f"{n_empty} links have no text or accessible name",
                 remediation="Add descriptive text or aria-label to links",
-                element=empty_links[0] if empty_links else None,
-                count=len(empty_links)
+                element=str(empty_links[0])[:100],
+                count=n_empty
             ))
 
         if vague_links:
+            n_vague = len(vague_links)
             findings.append(self.create_finding(
                 severity=SeverityLevel.WARNING,
-                message=f"{len(vague_links)} links have vague text (e.g., 'click here')",
+                message=f"{n_vague} links have vague text (e.g., 'click here')",
                 remediation="Use descriptive link text that makes sense out of context",
-                element=vague_links[0] if vague_links else None,
-                count=len(vague_links)
+                element=str(vague_links[0])[:100],
+                count=n_vague
             ))
 
-        if not findings and len(links) > 0:
+        if not findings:
             findings.append(self.create_finding(
                 severity=SeverityLevel.PASS,
                 message=f"All {len(links)} links have meaningful text",
                 remediation="N/A - Check passed"
             ))
-        elif not findings:
-            findings.append(self.create_finding(
-                severity=SeverityLevel.PASS,
-                message="No links found on page",
-                remediation="N/A - No links to check"
-            ))
 
         return findings
@@ -2,10 +2,13 @@
 WCAG Rules for Perceivable principle
 Success criteria related to making content perceivable to all users
 """
-from typing import List
+from typing import TYPE_CHECKING, List
 from models import Finding, SeverityLevel, WCAGLevel
 from .base import WCAGRule
 
+if TYPE_CHECKING:
+    from ..parser import Element, ParsedHTML
+
 
 class ImageAltTextRule(WCAGRule):
     """1.1.1 Non-text Content - Images must have alt text"""
@@ -15,23 +18,31 @@ class ImageAltTextRule(WCAGRule):
     wcag_level = WCAGLevel.AA
     principle = "Perceivable"
 
-    def check(self, parsed_html) -> List[Finding]:
+    def check(self, parsed_html: "ParsedHTML") -> List[Finding]:
         images = parsed_html.images
-        missing_alt = []
+        if not images:
+            return [self.create_finding(
+                severity=SeverityLevel.PASS,
+                message="All images have alt attributes",
+                remediation="N/A - Check passed"
+            )]
+
+        missing_alt: List["Element"] = []
 
         for img in images:
             alt = img.get('alt')
             # Check if alt is missing or empty (but allow alt="")
             if alt is None:
-                missing_alt.append(str(img)[:100])
+                missing_alt.append(img)
 
         if missing_alt:
+            n_bad = len(missing_alt)
             return [self.create_finding(
                 severity=SeverityLevel.FAIL,
-                message=f"{len(missing_alt)} images missing alt attribute",
+                message=f"{n_bad} images missing alt attribute",
                 remediation="Add descriptive alt text to all images. Use alt='' for decorative images.",
-                element=missing_alt[0] if missing_alt else None,
-                count=len(missing_alt)
+                element=str(missing_alt[0])[:100],
+                count=n_bad
             )]
         else:
             return [self.create_finding(
@@ -49,7 +60,7 @@ class HTMLLangAttributeRule(WCAGRule):
     wcag_level = WCAGLevel.AA
     principle = "Understandable"
 
-    def check(self, parsed_html) -> List[Finding]:
+    def check(self, parsed_html: "ParsedHTML") -> List[Finding]:
         html_tag = parsed_html.html_tag
 
         if not html_tag:
@@ -84,7 +95,7 @@ class PageTitleRule(WCAGRule):
     wcag_level = WCAGLevel.AA
     principle = "Operable"
 
-    def check(self, parsed_html) -> List[Finding]:
+    def check(self, parsed_html: "ParsedHTML") -> List[Finding]:
         title = parsed_html.title
 
         if not title:
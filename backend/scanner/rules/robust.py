@@ -2,10 +2,14 @@
 WCAG Rules for Robust principle
 Success criteria related to maximizing compatibility with assistive technologies
 """
-from typing import List
+from collections import Counter
+from typing import TYPE_CHECKING, ClassVar, FrozenSet, List, Tuple
 from models import Finding, SeverityLevel, WCAGLevel
 from .base import WCAGRule
 
+if TYPE_CHECKING:
+    from ..parser import Element, ParsedHTML
+
 
 class DuplicateIDRule(WCAGRule):
     """4.1.1 - IDs must be unique"""
@@ -15,25 +19,22 @@ class DuplicateIDRule(WCAGRule):
     wcag_level = WCAGLevel.AA
     principle = "Robust"
 
-    def check(self, parsed_html) -> List[Finding]:
+    def check(self, parsed_html: "ParsedHTML") -> List[Finding]:
         all_ids = parsed_html.get_all_ids()
 
-        # Find duplicates
-        seen = set()
-        duplicates = set()
-
-        for id_val in all_ids:
-            if id_val in seen:
-                duplicates.add(id_val)
-            seen.add(id_val)
+        # Find duplicates (in order of first appearance)
+        counts = Counter(all_ids)
+        duplicates = [id_val for id_val, n in counts.items() if n > 1]
 
         if duplicates:
-            dup_list = ', '.join(f"'{d}'" for d in list(duplicates)[:5])
+            n_bad = len(duplicates)
+            shown = [f"'{d}'" for d in duplicates[:5]]
+            dup_list = ', '.join(shown)
             return [self.create_finding(
                 severity=SeverityLevel.FAIL,
-                message=f"{len(duplicates)} duplicate IDs found: {dup_list}",
+                message=f"{n_bad} duplicate IDs found: {dup_list}",
                 remediation="Ensure all ID attributes are unique within the document",
-                count=len(duplicates)
+                count=n_bad
             )]
         elif len(all_ids) > 0:
             return [self.create_finding(
@@ -58,7 +59,7 @@ class ARIARoleValidRule(WCAGRule):
     principle = "Robust"
 
     # Valid ARIA 1.2 roles (subset of most common ones)
-    VALID_ROLES = {
+    VALID_ROLES: ClassVar[FrozenSet[str]] = frozenset({
         'alert', 'alertdialog', 'application', 'article', 'banner', 'button',
         'checkbox', 'columnheader', 'combobox', 'complementary', 'contentinfo',
         'definition', 'dialog', 'directory', 'document', 'feed', 'figure',
@@ -70,30 +71,34 @@ class ARIARoleValidRule(WCAGRule):
         'search', 'searchbox', 'separator', 'slider', 'spinbutton', 'status',
         'switch', 'tab', 'table', 'tablist', 'tabpanel', 'term', 'textbox',
         'timer', 'toolbar', 'tooltip', 'tree', 'treegrid', 'treeitem'
-    }
+    })
 
-    def check(self, parsed_html) -> List[Finding]:
-        elements_with_role = parsed_html.soup.find_all(attrs={"role": True})
-        invalid_roles = []
+    def check(self, parsed_html: "ParsedHTML") -> List[Finding]:
+        # Collected, stripped and lowercased during the parse-time pass, so
+        # no extra tree walk or string copies here
+        roles = parsed_html.roles_lowered
+        invalid_roles: List[Tuple[str, "Element"]] = []
+        valid_roles = self.VALID_ROLES
 
-        for elem in elements_with_role:
-            role = elem.get('role', '').strip().lower()
-            if role and role not in self.VALID_ROLES:
-                invalid_roles.append((role, str(elem)[:100]))
+        for elem, role in roles:
+            if role and role not in valid_roles:
+                invalid_roles.append((role, elem))
 
         if invalid_roles:
-            role_names = ', '.join(f"'{r[0]}'" for r in invalid_roles[:5])
+            n_bad = len(invalid_roles)
+            shown = [f"'{r[0]}'" for r in invalid_roles[:5]]
+            role_names = ', '.join(shown)
             return [self.create_finding(
                 severity=SeverityLevel.FAIL,
-                message=f"{len(invalid_roles)} invalid ARIA roles found: {role_names}",
+                message=f"{n_bad} invalid ARIA roles found: {role_names}",
                 remediation="Use only valid ARIA 1.2 role values",
-                element=invalid_roles[0][1] if invalid_roles else None,
-                count=len(invalid_roles)
+                element=str(invalid_roles[0][1])[:100],
+                count=n_bad
             )]
-        elif len(elements_with_role) > 0:
+        elif len(roles) > 0:
             return [self.create_finding(
                 severity=SeverityLevel.PASS,
-                message=f"All {len(elements_with_role)} ARIA roles are valid",
+                message=f"All {len(roles)} ARIA roles are valid",
                 remediation="N/A - Check passed"
             )]
         else:
@@ -2,10 +2,30 @@
 WCAG Rules for Understandable principle
 Success criteria related to making content understandable
 """
-from typing import List
+from typing import TYPE_CHECKING, List, Tuple
 from models import Finding, SeverityLevel, WCAGLevel
 from .base import WCAGRule
 
+if TYPE_CHECKING:
+    from ..parser import ParsedHTML
+
+
+def _find_skips(levels: List[int]) -> List[Tuple[int, int, int]]:
+    """
+    Find heading level skips
+
+    Returns (index, previous level, level) for every heading more than one
+    level below its predecessor. The first heading is compared against 0, so
+    a page not starting with h1 shows up at index 0.
+    """
+    skips = []
+    prev_level = 0
+    for i, level in enumerate(levels):
+        if level > prev_level + 1:
+            skips.append((i, prev_level, level))
+        prev_level = level
+    return skips
+
 
 class HeadingHierarchyRule(WCAGRule):
     """1.3.1 - Headings should not skip levels"""
@@ -15,7 +35,7 @@ class HeadingHierarchyRule(WCAGRule):
     wcag_level = WCAGLevel.AA
     principle = "Understandable"
 
-    def check(self, parsed_html) -> List[Finding]:
+    def check(self, parsed_html: "ParsedHTML") -> List[Finding]:
         headings = parsed_html.headings
 
         if not headings:
@@ -25,35 +45,27 @@ class HeadingHierarchyRule(WCAGRule):
                 remediation="Add heading structure (h1-h6) to organize content"
             )]
 
-        # Extract heading levels
-        levels = []
-        for h in headings:
-            level = int(h.name[1])  # h1 -> 1, h2 -> 2, etc.
-            levels.append(level)
-
-        # Check for skipped levels
-        skipped = []
-        prev_level = 0
+        # h1 -> 1, h2 -> 2, etc.
+        levels = [int(h.name[1]) for h in headings]
 
-        for i, level in enumerate(levels):
+        skipped: List[str] = []
+        for i, prev_level, level in _find_skips(levels):
             if i == 0:
-                if level != 1:
-                    skipped.append(f"First heading is {headings[i].name}, should start with h1")
+                skipped.append(f"First heading is {headings[i].name}, should start with h1")
             else:
-                if level > prev_level + 1:
-                    skipped.append(
-                        f"Skipped from {prev_level} to {level} "
-                        f"at heading: '{headings[i].get_text().strip()[:30]}'"
-                    )
-            prev_level = level
+                skipped.append(
+                    f"Skipped from {prev_level} to {level} "
+                    f"at heading: '{headings[i].get_text(strip=True)[:30]}'"
+                )
 
         if skipped:
+            n_bad = len(skipped)
             return [self.create_finding(
                 severity=SeverityLevel.WARNING,
-                message=f"Heading hierarchy has {len(skipped)} issues",
+                message=f"Heading hierarchy has {n_bad} issues",
                 remediation="Use sequential heading levels (h1 -> h2 -> h3) without skipping",
-                element=skipped[0] if skipped else None,
-                count=len(skipped)
+                element=skipped[0],
+                count=n_bad
             )]
         else:
             return [self.create_finding(
@@ -71,8 +83,9 @@ class H1ExistsRule(WCAGRule):
     wcag_level = WCAGLevel.AA
     principle = "Understandable"
 
-    def check(self, parsed_html) -> List[Finding]:
-        h1_elements = parsed_html.find_all('h1')
+    def check(self, parsed_html: "ParsedHTML") -> List[Finding]:
+        # Bucketed from the same parse-time pass as parsed_html.headings
+        h1_elements = parsed_html.h1_elements
         h1_count = len(h1_elements)
 
         if h1_count == 0:
@@ -82,7 +95,7 @@ class H1ExistsRule(WCAGRule):
                 remediation="Add a single <h1> element to serve as the main page heading"
             )]
         elif h1_count > 1:
-            h1_texts = [h.get_text().strip()[:30] for h in h1_elements[:3]]
+            h1_texts = [h.get_text(strip=True)[:30] for h in h1_elements[:3]]
             return [self.create_finding(
                 severity=SeverityLevel.WARNING,
                 message=f"Multiple <h1> elements found ({h1_count}): {', '.join(h1_texts)}",
@@ -90,7 +103,7 @@ class H1ExistsRule(WCAGRule):
                 count=h1_count
             )]
         else:
-            h1_text = h1_elements[0].get_text().strip()
+            h1_text = h1_elements[0].get_text(strip=True)
             return [self.create_finding(
                 severity=SeverityLevel.PASS,
                 message=f"Page has one <h1>: '{h1_text[:50]}'",
@@ -0,0 +1,52 @@
+"""
+Optional compiled build of the WCAG rule modules
+
+The rules run pure-Python loops over every element of a page, so compiling
+them to C extensions removes most of the interpreter overhead. The compiled
+modules sit next to the sources and are picked up automatically; deleting the
+generated .so files falls back to plain Python.
+
+Usage (from backend/):
+    pip install mypy
+    python setup.py build_ext --inplace
+
+or, to build with Cython instead of mypyc:
+    pip install cython
+    WEBSHEPHERD_COMPILER=cython python setup.py build_ext --inplace
+"""
+import os
+
+from setuptools import setup
+
+# scanner.parser and models stay interpreted: they lean on selectolax, lxml
+# and pydantic, which mypyc cannot compile against
+RULE_MODULES = [
+    "scanner/rules/base.py",
+    "scanner/rules/operable.py",
+    "scanner/rules/perceivable.py",
+    "scanner/rules/robust.py",
+    "scanner/rules/understandable.py",
+]
+
+COMPILER = os.environ.get("WEBSHEPHERD_COMPILER", "mypyc")
+
+if COMPILER == "cython":
+    from Cython.Build import cythonize
+
+    # Cython compiles the same .py sources in pure-Python mode, so there is
+    # no separate .pyx to keep in sync
+    ext_modules = cythonize(RULE_MODULES, compiler_directives={"language_level": "3"})
+elif COMPILER == "mypyc":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(
+        ["--ignore-missing-imports", "--follow-imports=silent", *RULE_MODULES],
+        opt_level="3",
+    )
+else:
+    raise SystemExit(f"Unknown WEBSHEPHERD_COMPILER: {COMPILER!r} (use 'mypyc' or 'cython')")
+
+setup(
+    name="webshepherd-rules",
+    ext_modules=ext_modules,
+)
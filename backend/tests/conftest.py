@@ -0,0 +1,12 @@
+"""
+Shared pytest setup: make the backend modules importable as top-level
+modules (config, models, scanner, ...) like uvicorn does when run from backend/,
+and point the app at an in-memory database
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep test scans out of the real database file
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
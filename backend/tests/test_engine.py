@@ -0,0 +1,81 @@
+"""
+Tests for ScanEngine's single-flight handling of concurrent scans
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from scanner.engine import ScanEngine
+
+
+def make_engine(delay: float = 0.05, error: Exception = None):
+    """ScanEngine whose _run_scan is replaced by a counting stub"""
+    engine = ScanEngine()
+    engine.calls = 0
+
+    async def run_scan(url):
+        engine.calls += 1
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return SimpleNamespace(scan_id=f"scan-{engine.calls}", url=url)
+
+    engine._run_scan = run_scan
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_concurrent_scans_of_same_url_share_one_run():
+    engine = make_engine()
+
+    results = await asyncio.gather(*(engine.scan_url("https://a.com/") for _ in range(3)))
+
+    assert engine.calls == 1
+    assert all(r is results[0] for r in results)
+    assert engine._response_cache[results[0].scan_id] is results[0]
+    assert engine._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_different_urls_are_scanned_separately():
+    engine = make_engine()
+
+    a, b = await asyncio.gather(engine.scan_url("https://a.com/"), engine.scan_url("https://b.com/"))
+
+    assert engine.calls == 2
+    assert a.url != b.url
+
+
+@pytest.mark.asyncio
+async def test_cancelling_leader_does_not_cancel_joiners():
+    engine = make_engine(delay=0.1)
+
+    leader = asyncio.create_task(engine.scan_url("https://a.com/"))
+    await asyncio.sleep(0)
+    joiners = [asyncio.create_task(engine.scan_url("https://a.com/")) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    leader.cancel()
+    results = await asyncio.gather(leader, *joiners, return_exceptions=True)
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1] is results[2]
+    assert results[1].scan_id == "scan-1"
+    assert engine.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_scan_raises_for_every_caller():
+    engine = make_engine(error=ValueError("boom"))
+
+    results = await asyncio.gather(
+        engine.scan_url("https://a.com/"),
+        engine.scan_url("https://a.com/"),
+        return_exceptions=True
+    )
+
+    assert [str(r) for r in results] == ["boom", "boom"]
+    assert engine.calls == 1
+    assert engine._inflight == {}
+    assert len(engine._response_cache) == 0
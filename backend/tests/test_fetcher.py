@@ -0,0 +1,235 @@
+"""
+Tests for the URL fetcher and its adaptive (AIMD) concurrency limiter
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from scanner.fetcher import AIMDLimiter, URLFetcher
+
+
+def make_fetcher(handler) -> URLFetcher:
+    """URLFetcher whose client answers every request with handler"""
+    fetcher = URLFetcher()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return fetcher
+
+
+@pytest.mark.asyncio
+async def test_fast_successes_grow_the_limit_up_to_max():
+    limiter = AIMDLimiter(max_limit=4, increase=0.5)
+    limiter.limit = 2.0
+
+    for _ in range(6):
+        await limiter.acquire()
+        limiter.release(overloaded=False, latency=0.1)
+
+    assert limiter.limit == 4
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_overload_halves_the_limit_down_to_min():
+    limiter = AIMDLimiter(max_limit=8, min_limit=1, decrease=0.5)
+
+    await limiter.acquire()
+    limiter.release(overloaded=True, latency=1.0)
+    assert limiter.limit == 4
+
+    for _ in range(5):
+        await limiter.acquire()
+        limiter.release(overloaded=True, latency=1.0)
+    assert limiter.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_success_does_not_grow_the_limit():
+    limiter = AIMDLimiter(max_limit=8)
+    limiter.limit = 2.0
+
+    await limiter.acquire()
+    limiter.release(overloaded=False, latency=0.1)
+    assert limiter.limit == 2.5
+
+    await limiter.acquire()
+    limiter.release(overloaded=False, latency=1.0)  # over twice the median
+    assert limiter.limit == 2.5
+
+
+@pytest.mark.asyncio
+async def test_waiters_get_slots_in_fifo_order():
+    limiter = AIMDLimiter(max_limit=1)
+    await limiter.acquire()
+
+    order = []
+
+    async def worker(name):
+        await limiter.acquire()
+        order.append(name)
+        limiter.release(overloaded=False, latency=0.1)
+
+    tasks = [asyncio.create_task(worker(n)) for n in ("a", "b", "c")]
+    await asyncio.sleep(0)
+    assert order == []
+
+    limiter.release(overloaded=False, latency=0.1)
+    await asyncio.gather(*tasks)
+
+    assert order == ["a", "b", "c"]
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = AIMDLimiter(max_limit=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    limiter.release(overloaded=False, latency=0.1)
+    assert limiter.active == 0
+
+    await asyncio.wait_for(limiter.acquire(), timeout=1)
+    assert limiter.active == 1
+
+
+@pytest.mark.asyncio
+async def test_slot_handed_over_during_cancellation_is_returned():
+    limiter = AIMDLimiter(max_limit=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    limiter.release(overloaded=False, latency=0.1)  # hands the slot to the waiter
+    waiter.cancel()  # ...which is cancelled before it resumes
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_overloaded_host_does_not_throttle_other_hosts():
+    active = {"b.test": 0}
+    peak = {"b.test": 0}
+
+    async def handler(request):
+        host = request.url.host
+        if host == "a.test":
+            return httpx.Response(500)
+        active[host] += 1
+        peak[host] = max(peak[host], active[host])
+        await asyncio.sleep(0.02)
+        active[host] -= 1
+        return httpx.Response(200, headers={"content-type": "text/html"}, text="<html></html>")
+
+    fetcher = make_fetcher(handler)
+    fetcher.host_limit = 4
+
+    for _ in range(6):
+        with pytest.raises(ValueError, match="HTTP 500"):
+            await fetcher.fetch("https://a.test/")
+    assert fetcher._throttled_hosts["a.test"].limit == 1
+
+    await asyncio.gather(*(fetcher.fetch(f"https://b.test/{i}") for i in range(8)))
+    assert peak["b.test"] == 4
+    assert "b.test" not in fetcher._throttled_hosts
+
+    await fetcher.close()
+
+
+@pytest.mark.asyncio
+async def test_throttled_host_keeps_its_limit_between_scans():
+    async def handler(request):
+        return httpx.Response(503)
+
+    fetcher = make_fetcher(handler)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await fetcher.fetch("https://a.test/")
+
+    assert fetcher._host_slots == {}
+    assert fetcher._throttled_hosts["a.test"].limit == fetcher.host_limit / 4
+
+    await fetcher.close()
+
+
+class CountingStream(httpx.AsyncByteStream):
+    """Response body of `chunks` pieces of `size` bytes that counts reads"""
+
+    def __init__(self, chunks: int, size: int = 16 * 1024):
+        self.chunks = chunks
+        self.size = size
+        self.reads = 0
+
+    async def __aiter__(self):
+        for _ in range(self.chunks):
+            self.reads += 1
+            yield b"x" * self.size
+
+
+@pytest.mark.asyncio
+async def test_download_stops_once_body_exceeds_max_size():
+    stream = CountingStream(chunks=1000)  # ~16 MB if read to the end
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": "text/html"}, stream=stream)
+
+    fetcher = make_fetcher(handler)
+    fetcher.max_size = 100 * 1024
+
+    with pytest.raises(ValueError, match="Content too large"):
+        await fetcher.fetch("https://a.test/")
+    assert stream.reads < 20
+
+    await fetcher.close()
+
+
+@pytest.mark.asyncio
+async def test_download_rejects_oversized_content_length_before_reading():
+    stream = CountingStream(chunks=10)
+
+    def handler(request):
+        headers = {"content-type": "text/html", "content-length": str(50 * 1024 * 1024)}
+        return httpx.Response(200, headers=headers, stream=stream)
+
+    fetcher = make_fetcher(handler)
+
+    with pytest.raises(ValueError, match="Content too large: 50.0 MB"):
+        await fetcher.fetch("https://a.test/")
+    assert stream.reads == 0
+
+    await fetcher.close()
+
+
+@pytest.mark.asyncio
+async def test_download_rejects_non_html_content():
+    def handler(request):
+        return httpx.Response(200, json={"not": "html"})
+
+    fetcher = make_fetcher(handler)
+
+    with pytest.raises(ValueError, match="Invalid content type: application/json"):
+        await fetcher.fetch("https://a.test/")
+
+    await fetcher.close()
+
+
+@pytest.mark.asyncio
+async def test_download_decodes_with_response_charset():
+    body = "<html><body>Café – naïve</body></html>"
+
+    def handler(request):
+        headers = {"content-type": "text/html; charset=windows-1252"}
+        return httpx.Response(200, headers=headers, content=body.encode("windows-1252"))
+
+    fetcher = make_fetcher(handler)
+
+    assert await fetcher.fetch("https://a.test/") == body
+
+    await fetcher.close()
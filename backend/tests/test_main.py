@@ -0,0 +1,26 @@
+"""
+Integration tests for the FastAPI app
+"""
+from fastapi.testclient import TestClient
+
+import main
+
+PAGE = "<html lang='en'><head><title>Test page</title></head><body><h1>Hi</h1></body></html>"
+
+
+async def fake_fetch(url):
+    return PAGE
+
+
+def test_app_can_start_twice(monkeypatch):
+    """Shutdown releases the rule pool and fetcher, and startup recreates them"""
+    monkeypatch.setattr(main.scan_engine.fetcher, "fetch", fake_fetch)
+
+    for _ in range(2):
+        with TestClient(main.app) as client:
+            response = client.post("/api/scan/", json={"url": "https://example.com"})
+            assert response.status_code == 200
+            assert response.json()["status"] == "complete"
+
+        assert main.scan_engine.rule_executor is None
+        assert main.scan_engine.fetcher.client is None
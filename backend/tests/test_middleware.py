@@ -0,0 +1,120 @@
+"""
+Tests for the pure ASGI rate limiter
+"""
+import json
+
+import pytest
+
+import middleware
+from middleware import PureASGIRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(middleware.time, "monotonic", fake)
+    return fake
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def call(app, path="/api/scan/", method="POST", ip="1.2.3.4"):
+    """Send one HTTP request through the app; return (status, headers, body)"""
+    scope = {"type": "http", "method": method, "path": path, "headers": [], "client": (ip, 1234)}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start, body = messages
+    return start["status"], dict(start["headers"]), body["body"]
+
+
+def make_limiter(limit=2, window=60):
+    return PureASGIRateLimiter(ok_app, limit=limit, window_seconds=window, paths=["/api/scan/"])
+
+
+@pytest.mark.asyncio
+async def test_rejects_requests_over_the_limit(clock):
+    app = make_limiter()
+
+    assert (await call(app))[0] == 200
+    assert (await call(app))[0] == 200
+    status, headers, body = await call(app)
+
+    assert status == 429
+    assert headers[b"retry-after"] == b"60"
+    assert json.loads(body) == {"error": "Rate limit exceeded: 2 per 60 seconds", "status_code": 429}
+
+
+@pytest.mark.asyncio
+async def test_window_slides(clock):
+    app = make_limiter()
+    await call(app)
+    clock.now += 30
+    await call(app)
+
+    clock.now += 20
+    status, headers, _ = await call(app)
+    assert status == 429
+    assert headers[b"retry-after"] == b"10"
+
+    clock.now += 10  # first request has left the window
+    assert (await call(app))[0] == 200
+
+
+@pytest.mark.asyncio
+async def test_only_matching_paths_and_methods_are_counted(clock):
+    app = make_limiter(limit=1)
+
+    for _ in range(3):
+        assert (await call(app, path="/api/stats"))[0] == 200
+        assert (await call(app, method="GET"))[0] == 200
+    assert (await call(app))[0] == 200
+    assert (await call(app))[0] == 429
+
+
+@pytest.mark.asyncio
+async def test_clients_are_limited_separately(clock):
+    app = make_limiter(limit=1)
+
+    assert (await call(app, ip="1.1.1.1"))[0] == 200
+    assert (await call(app, ip="2.2.2.2"))[0] == 200
+    assert (await call(app, ip="1.1.1.1"))[0] == 429
+
+
+@pytest.mark.asyncio
+async def test_idle_clients_are_forgotten(clock):
+    app = make_limiter()
+    await call(app, ip="1.1.1.1")
+
+    clock.now += 61
+    await call(app, ip="2.2.2.2")
+
+    assert list(app._hits) == ["2.2.2.2"]
+
+
+@pytest.mark.asyncio
+async def test_zero_limit_rejects_every_request(clock):
+    app = make_limiter(limit=0)
+
+    status, headers, _ = await call(app)
+
+    assert status == 429
+    assert headers[b"retry-after"] == b"60"
+    assert (await call(app, path="/api/stats"))[0] == 200
@@ -0,0 +1,58 @@
+"""
+Tests for request validation in the Pydantic models
+"""
+import pytest
+from pydantic import ValidationError
+
+from models import ScanRequest
+
+
+@pytest.mark.parametrize("url", [
+    "http://localhost/",
+    "http://localhost:8000/",
+    "http://localhost./",
+    "http://app.localhost/",
+    "http://127.0.0.1/",
+    "http://[::1]/",
+])
+def test_rejects_localhost(url):
+    with pytest.raises(ValidationError, match="Cannot scan localhost URLs"):
+        ScanRequest(url=url)
+
+
+@pytest.mark.parametrize("url", [
+    "http://10.1.2.3/",
+    "http://172.16.0.1/",
+    "http://192.168.1.1/",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://100.64.0.1/",  # Shared address space (carrier-grade NAT)
+    "http://192.0.2.10/",  # Documentation range
+    "http://224.0.0.1/",   # Multicast
+    "http://0.0.0.0/",
+])
+def test_rejects_private_addresses(url):
+    with pytest.raises(ValidationError, match="Cannot scan private IP addresses"):
+        ScanRequest(url=url)
+
+
+@pytest.mark.parametrize("url", [
+    "http://[::ffff:127.0.0.1]/",  # IPv4-mapped loopback
+    "http://2130706433/",          # 127.0.0.1 as a single integer
+])
+def test_rejects_disguised_loopback(url):
+    with pytest.raises(ValidationError):
+        ScanRequest(url=url)
+
+
+def test_rejects_non_http_schemes():
+    with pytest.raises(ValidationError):
+        ScanRequest(url="ftp://example.com/")
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com",
+    "https://abc10.com/",  # Contains "10." but is a domain name
+    "http://8.8.8.8/",
+])
+def test_accepts_public_urls(url):
+    assert ScanRequest(url=url).url.host == url.split("/")[2]
@@ -0,0 +1,74 @@
+"""
+Tests for the HTML parser and its parse-time element buckets
+"""
+import lxml.html
+
+from scanner.parser import HTMLParser, ParsedHTML
+
+COMMENTED_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><!-- head comment --><title>Comments</title></head>
+<body>
+<!-- <img src="hidden.png"> -->
+<h1>Main</h1>
+<!-- a comment between elements -->
+<a href="/x">Docs</a>
+<form><!-- inside a form --><label for="q">Search</label><input id="q"></form>
+</body>
+</html>"""
+
+
+def test_parse_page_with_comments():
+    """Comment nodes are skipped instead of being wrapped as elements"""
+    parsed = HTMLParser().parse(COMMENTED_PAGE)
+
+    assert parsed.backend == "lexbor"
+    assert parsed.title == "Comments"
+    assert parsed.images == []
+    assert [h.name for h in parsed.headings] == ["h1"]
+    assert len(parsed.links) == 1
+    assert len(parsed.inputs) == 1
+    assert "q" in parsed.labels_by_for
+
+
+def test_parse_many_commented_elements():
+    """Regression: pages full of comments used to crash selectolax"""
+    html = "<html><body>" + "".join(f"<!-- {i} --><div id='d{i}'></div>" for i in range(300)) + "</body></html>"
+    parsed = HTMLParser().parse(html)
+
+    assert len(parsed.get_all_ids()) == 300
+
+
+def test_lxml_backend_skips_comments():
+    """The lxml fallback buckets the same elements as Lexbor"""
+    tree = lxml.html.document_fromstring(COMMENTED_PAGE)
+    parsed = ParsedHTML(tree, COMMENTED_PAGE, backend="lxml")
+
+    assert parsed.title == "Comments"
+    assert parsed.images == []
+    assert [h.name for h in parsed.headings] == ["h1"]
+    assert len(parsed.inputs) == 1
+
+
+def test_find_only_searches_descendants():
+    """Element.find skips the element itself on both backends"""
+    html = "<html><body><div id='outer'><span><div id='inner'></div></span></div><p></p></body></html>"
+    lexbor = HTMLParser().parse(html)
+    lxml_parsed = ParsedHTML(lxml.html.document_fromstring(html), html, backend="lxml")
+
+    for parsed in (lexbor, lxml_parsed):
+        outer = parsed.find("div", id="outer")
+        assert outer.find("div").get("id") == "inner"
+        assert outer.find("p") is None
+        assert outer.find("div").find("div") is None
+
+
+def test_roles_are_normalized_at_parse_time():
+    """Roles come stripped and lowercased; canonical values are reused as is"""
+    html = "<div role='banner'></div><p role=' Main '></p><i role='NAV'></i><b role=''></b>"
+    parsed = HTMLParser().parse(html)
+
+    roles = [role for _, role in parsed.roles_lowered]
+    assert roles == ["banner", "main", "nav", ""]
+    elem, role = parsed.roles_lowered[0]
+    assert role is elem.attrs["role"]
@@ -0,0 +1,99 @@
+"""
+Tests running every WCAG rule against sample pages on both parser backends
+
+Only scanner.parser, scanner.rules and models are imported, so this module
+also runs on PyPy (see .github/workflows/tests.yml).
+"""
+import lxml.html
+import pytest
+
+from scanner.parser import HTMLParser, ParsedHTML
+from scanner.rules import ALL_RULES
+
+SAMPLE_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><title>Sample page</title><!-- analytics snippet removed --></head>
+<body>
+<!-- <h3>commented-out heading</h3> -->
+<h1>Main</h1>
+<h3>Skipped a level</h3>
+<img src="logo.png" alt="Logo"><img src="photo.jpg">
+<!-- navigation -->
+<a href="/docs">Documentation</a><a href="/more">Read more</a><a href="/x"></a>
+<form>
+  <label for="name">Name</label><input id="name">
+  <label>Email <input type="email"></label>
+  <input type="text" name="nolabel"><!-- TODO label this -->
+  <input type="hidden" name="csrf">
+  <button>Send</button><button></button>
+</form>
+<div id="dup" role="banner"></div><p id="dup" role="bogus"></p><span role=" Navigation "></span>
+</body>
+</html>"""
+
+
+def parse(html: str, backend: str) -> ParsedHTML:
+    if backend == "lexbor":
+        parsed = HTMLParser().parse(html)
+        assert parsed.backend == "lexbor"
+        return parsed
+    return ParsedHTML(lxml.html.document_fromstring(html), html, backend="lxml")
+
+
+def run_rules(parsed: ParsedHTML):
+    """(rule_code, severity, count, message) for every finding, in registry order"""
+    return [
+        (f.rule_code, f.severity.value, f.count, f.message)
+        for rule in ALL_RULES
+        for f in rule().check(parsed)
+    ]
+
+
+@pytest.fixture(params=["lexbor", "lxml"])
+def backend(request):
+    return request.param
+
+
+def test_sample_page(backend):
+    assert run_rules(parse(SAMPLE_PAGE, backend)) == [
+        ("IMG_ALT_MISSING", "fail", 1, "1 images missing alt attribute"),
+        ("HTML_LANG_MISSING", "pass", 1, "Page language is set to 'en'"),
+        ("PAGE_TITLE_MISSING", "pass", 1, "Page has title: 'Sample page'"),
+        ("FORM_LABEL_MISSING", "fail", 1, "1 form inputs missing labels"),
+        ("BUTTON_NAME_MISSING", "fail", 1, "1 buttons missing accessible names"),
+        ("LINK_TEXT_EMPTY", "fail", 1, "1 links have no text or accessible name"),
+        ("LINK_TEXT_EMPTY", "warning", 1, "1 links have vague text (e.g., 'click here')"),
+        ("HEADING_SKIP_LEVEL", "warning", 1, "Heading hierarchy has 1 issues"),
+        ("H1_MISSING_OR_MULTIPLE", "pass", 1, "Page has one <h1>: 'Main'"),
+        ("DUPLICATE_ID", "fail", 1, "1 duplicate IDs found: 'dup'"),
+        ("ARIA_ROLE_INVALID", "fail", 1, "1 invalid ARIA roles found: 'bogus'"),
+    ]
+
+
+def test_sample_page_reports_offending_elements():
+    findings = {
+        (f.rule_code, f.severity.value): f.element
+        for rule in ALL_RULES
+        for f in rule().check(parse(SAMPLE_PAGE, "lexbor"))
+    }
+
+    assert findings[("IMG_ALT_MISSING", "fail")] == '<img src="photo.jpg">'
+    assert findings[("FORM_LABEL_MISSING", "fail")] == '<input type="text" name="nolabel">'
+    assert findings[("BUTTON_NAME_MISSING", "fail")] == "<button></button>"
+    assert findings[("LINK_TEXT_EMPTY", "warning")] == '<a href="/more">Read more</a>'
+    assert findings[("HEADING_SKIP_LEVEL", "warning")] == "Skipped from 1 to 3 at heading: 'Skipped a level'"
+
+
+def test_empty_page(backend):
+    assert run_rules(parse("<html><body><!-- nothing here --></body></html>", backend)) == [
+        ("IMG_ALT_MISSING", "pass", 1, "All images have alt attributes"),
+        ("HTML_LANG_MISSING", "fail", 1, "<html> tag missing lang attribute"),
+        ("PAGE_TITLE_MISSING", "fail", 1, "Page has no <title> element"),
+        ("FORM_LABEL_MISSING", "pass", 1, "No form inputs found on page"),
+        ("BUTTON_NAME_MISSING", "pass", 1, "No buttons found on page"),
+        ("LINK_TEXT_EMPTY", "pass", 1, "No links found on page"),
+        ("HEADING_SKIP_LEVEL", "warning", 1, "No heading elements found on page"),
+        ("H1_MISSING_OR_MULTIPLE", "warning", 1, "No <h1> element found on page"),
+        ("DUPLICATE_ID", "pass", 1, "No ID attributes found"),
+        ("ARIA_ROLE_INVALID", "pass", 1, "No ARIA roles found"),
+    ]